@@ -19,6 +19,7 @@ from welfare_diplomacy_baselines.baselines import no_press_policies
 
 from backends import (
     ClaudeCompletionBackend,
+    DiskCachedBackend,
     OpenAIChatBackend,
     OpenAICompletionBackend,
     HuggingFaceCausalLMBackend,
@@ -56,18 +57,30 @@ class Agent(ABC):
 class RandomAgent(Agent):
     """Takes random actions and sends 1 random message."""
 
+    def __init__(self, seed: int = 0, **_):
+        """Store the seed for per-power generators and decide the wandb wait time."""
+        self.seed = seed
+        # One agent plays every baseline power, so give each power its own
+        # generator to keep draws independent of the order powers respond in
+        self.power_name_to_rng: dict[str, random.Random] = {}
+        self.sleep_time = get_wandb_sleep_time()
+
     def __repr__(self) -> str:
         return "RandomAgent()"
 
     def respond(self, params: AgentParams) -> AgentResponse:
         """Randomly generate orders and messages."""
+        if params.power.name not in self.power_name_to_rng:
+            power_index = sorted(params.game.map.powers).index(params.power.name)
+            self.power_name_to_rng[params.power.name] = random.Random(
+                self.seed + power_index
+            )
+        rng = self.power_name_to_rng[params.power.name]
+
         # For each power, randomly sampling a valid order
         power_orders = []
         for loc in params.game.get_orderable_locations(params.power.name):
             if params.possible_orders[loc]:
-                # Sort for determinism
-                params.possible_orders[loc].sort()
-
                 # If this is a disbandable unit in an adjustment phase in welfare,
                 # then randomly choose whether to disband or not
                 if (
@@ -76,10 +89,10 @@ class RandomAgent(Agent):
                     and params.game.welfare
                 ):
                     power_orders.append(
-                        random.choice(["WAIVE", params.possible_orders[loc][0]])
+                        rng.choice(["WAIVE", params.possible_orders[loc][0]])
                     )
                 else:
-                    power_orders.append(random.choice(params.possible_orders[loc]))
+                    power_orders.append(rng.choice(params.possible_orders[loc]))
         # # Testing: Randomly add an invalid order
         # if random.random() < 0.1:
         #     power_orders.append("Random invalid order")
@@ -96,16 +109,11 @@ class RandomAgent(Agent):
         other_powers = [p for p in params.game.powers if p != params.power.name] + [
             "GLOBAL"
         ]
-        recipient = random.choice(other_powers)
-        message = f"Hello {recipient}! I'm {params.power.name} contacting you on turn {params.game.get_current_phase()}. Here's a random number: {random.randint(0, 100)}."
+        recipient = rng.choice(other_powers)
+        message = f"Hello {recipient}! I'm {params.power.name} contacting you on turn {params.game.get_current_phase()}. Here's a random number: {rng.randint(0, 100)}."
 
         # Sleep to allow wandb to catch up
-        sleep_time = (
-            0.0
-            if isinstance(wandb.run.mode, wandb.sdk.lib.disabled.RunDisabled)
-            else 0.3
-        )
-        time.sleep(sleep_time)
+        time.sleep(self.sleep_time)
 
         return AgentResponse(
             reasoning="Randomly generated orders and messages.",
@@ -116,7 +124,7 @@ class RandomAgent(Agent):
             prompt_tokens=0,
             completion_tokens=0,
             total_tokens=0,
-            completion_time_sec=sleep_time,
+            completion_time_sec=self.sleep_time,
         )
 
 
@@ -126,6 +134,7 @@ class ManualAgent(Agent):
     def __init__(self, manual_orders_path: str, **_):
         """Load the manual orders."""
         assert manual_orders_path
+        self.sleep_time = get_wandb_sleep_time()
         self.manual_orders_path = manual_orders_path
         with open(manual_orders_path, "r") as file:
             self.manual_orders: dict[str, list[str]] = yaml.safe_load(file)
@@ -166,12 +175,7 @@ class ManualAgent(Agent):
         user_prompt = prompts.get_user_prompt(params)
 
         # Sleep to allow wandb to catch up
-        sleep_time = (
-            0.0
-            if isinstance(wandb.run.mode, wandb.sdk.lib.disabled.RunDisabled)
-            else 0.3
-        )
-        time.sleep(sleep_time)
+        time.sleep(self.sleep_time)
 
         return AgentResponse(
             reasoning="Manually specified orders and messages.",
@@ -182,7 +186,7 @@ class ManualAgent(Agent):
             prompt_tokens=0,
             completion_tokens=0,
             total_tokens=0,
-            completion_time_sec=sleep_time,
+            completion_time_sec=self.sleep_time,
         )
 
 
@@ -218,6 +222,9 @@ class LLMAgent(Agent):
             # Chat models can't specify the start of the completion
             self.use_completion_preface = False
             self.backend = OpenAIChatBackend(model_name)
+        prompt_cache_dir = kwargs.pop("prompt_cache_dir", None)
+        if prompt_cache_dir:
+            self.backend = DiskCachedBackend(self.backend, prompt_cache_dir)
         self.temperature = kwargs.pop("temperature", 0.7)
         self.top_p = kwargs.pop("top_p", 1.0)
 
@@ -234,9 +241,6 @@ class LLMAgent(Agent):
         response = None
         year = int(params.game.phase.split()[1])
 
-        print(f"\n\n\n{params.power.name} is playing.")
-        print("Powers playing RL policy: ", [name for name, flag in self.policies.items() if flag != 0])
-
         if self.policies[params.power.name] != 0:
 
             if year == params.final_game_year and "A" in params.game.phase_type:
@@ -345,7 +349,6 @@ class LLMAgent(Agent):
                     messages[recipient.upper()] = message
 
                 commit = "I commit to the RL policy" in completion["messages"].get("Global", "")
-                print(f"{params.power.name}'s message to Global: ", completion["messages"].get("Global", ""))
                 if commit:
                     # Instantiate RL policy
                     print(params.power.name + " is switching to the RL policy!!")
@@ -394,8 +397,7 @@ class LLMAgent(Agent):
                 print(f"Full response causing the error: {response}")
                 #import pdb; pdb.set_trace()
                 raise AgentCompletionError(f"Exception: {exc}\n\Response: {response}")
-            
-        print(f"{params.power.name}'s reasoning for the current round: {reasoning}")
+
         return AgentResponse(
             reasoning=reasoning,
             orders=orders,
@@ -559,11 +561,18 @@ class ExploiterAgent(Agent):
             )
 
 
+def get_wandb_sleep_time() -> float:
+    """Seconds to sleep after each non-LLM response to allow wandb to catch up."""
+    return (
+        0.0 if isinstance(wandb.run.mode, wandb.sdk.lib.disabled.RunDisabled) else 0.3
+    )
+
+
 def model_name_to_agent(model_name: str, **kwargs) -> Agent:
     """Given a model name, return an instantiated corresponding agent."""
     model_name = model_name.lower()
     if model_name == "random":
-        return RandomAgent()
+        return RandomAgent(**kwargs)
     elif model_name == "manual":
         return ManualAgent(**kwargs)
     elif model_name == "nopress":
@@ -1,6 +1,12 @@
 """Language model backends."""
 
 from abc import ABC, abstractmethod
+import dataclasses
+import functools
+import hashlib
+import json
+import os
+import threading
 from anthropic import Anthropic, HUMAN_PROMPT, AI_PROMPT
 from anthropic._exceptions import APIError
 import time
@@ -239,12 +245,18 @@ class OpenAICompletionBackend(LanguageModelBackend):
         return response
 
 
+@functools.cache
+def _get_anthropic_client() -> Anthropic:
+    """Shared Anthropic client so all Claude backends reuse one connection pool."""
+    # Remember to provide a ANTHROPIC_API_KEY environment variable
+    return Anthropic()
+
+
 class ClaudeCompletionBackend:
     """Claude completion backend (e.g. claude-2)."""
 
     def __init__(self, model_name):
-        # Remember to provide a ANTHROPIC_API_KEY environment variable
-        self.anthropic = Anthropic()
+        self.anthropic = _get_anthropic_client()
         self.model_name = model_name
         self.max_tokens = 1000
 
@@ -288,3 +300,71 @@ class ClaudeCompletionBackend:
         response = self.anthropic.completions.create(**kwargs)
         assert response is not None, "Anthropic response is None"
         return response
+
+
+class DiskCachedBackend(LanguageModelBackend):
+    """
+    Wraps another backend, caching its completions as JSON files in a directory.
+
+    Only completions with temperature 0 are cached, since sampled completions shouldn't
+    be replayed. Files are keyed on a hash of the model, sampling parameters, and
+    prompts, and cache hits report a completion time of 0.
+    """
+
+    def __init__(self, backend, cache_dir: str):
+        super().__init__()
+        self.backend = backend
+        self.model_name = backend.model_name
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        completion_preface: str = "",
+        temperature: float = 1.0,
+        top_p: float = 1.0,
+    ) -> BackendResponse:
+        if temperature != 0.0:
+            return self.backend.complete(
+                system_prompt,
+                user_prompt,
+                completion_preface=completion_preface,
+                temperature=temperature,
+                top_p=top_p,
+            )
+
+        key = hashlib.blake2b(
+            "\0".join(
+                [
+                    self.model_name,
+                    str(temperature),
+                    str(top_p),
+                    system_prompt,
+                    user_prompt,
+                    completion_preface,
+                ]
+            ).encode(),
+            digest_size=16,
+        ).hexdigest()
+        cache_path = os.path.join(self.cache_dir, f"{key}.json")
+        if os.path.exists(cache_path):
+            with open(cache_path, encoding="utf-8") as file:
+                cached_response = json.load(file)
+            cached_response["completion_time_sec"] = 0.0
+            return BackendResponse(**cached_response)
+
+        response = self.backend.complete(
+            system_prompt,
+            user_prompt,
+            completion_preface=completion_preface,
+            temperature=temperature,
+            top_p=top_p,
+        )
+        # Write to a temporary file first so concurrent readers never see partial JSON
+        temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(dataclasses.asdict(response), file)
+        os.replace(temp_path, cache_path)
+        return response
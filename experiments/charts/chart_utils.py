@@ -2,15 +2,23 @@
 Functions to help with creating charts.
 """
 
+import functools
 import os
 import json
 import random
-from typing import Any
+from typing import Any, Optional
 
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
+
+# Charts are only saved to files, so use the non-interactive backend even with a display
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # pylint: disable=wrong-import-position
+import pandas as pd
 import seaborn as sns
 
+DEFAULT_COLOR_PALETTE = "colorblind"
+
 
 def set_seed(seed: int) -> None:
     """Set the seed for numpy and tensorflow."""
@@ -18,22 +26,27 @@ def set_seed(seed: int) -> None:
     np.random.seed(seed)
 
 
+BOOTSTRAP_MAX_BATCH_ELEMENTS = 10_000_000  # Bounds peak memory of the index matrix
+
+
 def bootstrapped_stdev(data: list[Any], num_samples: int = 1000) -> Any:
     """
     Bootstrap a stdev by sampling the whole dataset with replacement N times.
 
     We calculate the average of each sample, then take the stdev of the averages.
+    All samples are drawn at once as a (num_samples, len(data)) index matrix,
+    split into row batches when the matrix would get too large.
     """
-    averages = []
-    for _ in range(num_samples):
-        # Sample the data with replacement
-        sample = np.random.choice(data, size=len(data), replace=True)
-
-        # Calculate the average of the sample
-        average = np.average(sample)
+    values = np.asarray(data)
+    num_values = len(values)
 
-        # Add the average to the array
-        averages.append(average)
+    # Sample the data with replacement and average each sample, in batches of rows
+    batch_size = max(1, BOOTSTRAP_MAX_BATCH_ELEMENTS // max(1, num_values))
+    averages = np.empty(num_samples)
+    for start in range(0, num_samples, batch_size):
+        stop = min(start + batch_size, num_samples)
+        indices = np.random.randint(0, num_values, size=(stop - start, num_values))
+        averages[start:stop] = values[indices].mean(axis=1)
 
     # Calculate the standard deviation of the averages
     stdev = np.std(averages)
@@ -49,6 +62,38 @@ def load_json(file_path: str) -> dict[str, Any]:
     return file_data
 
 
+def load_cached(
+    file_path: str,
+    columns: Optional[list[str]] = None,
+    dtype: Optional[dict[str, str]] = None,
+) -> pd.DataFrame:
+    """
+    Load a CSV file into a dataframe, caching it as a sibling Parquet file.
+
+    Only the given columns are parsed, with the given dtypes, so the cache holds the
+    same typed subset. The Parquet copy is rebuilt whenever the CSV is newer than it
+    or lacks a requested column. If no Parquet engine is installed (or the data
+    can't be converted), the CSV is read directly.
+    """
+    parquet_path = file_path + ".parquet"
+    if os.path.exists(parquet_path) and os.path.getmtime(
+        parquet_path
+    ) >= os.path.getmtime(file_path):
+        try:
+            return pd.read_parquet(parquet_path, columns=columns)
+        except (ImportError, KeyError, ValueError):
+            pass
+
+    df = pd.read_csv(file_path, usecols=columns, dtype=dtype)
+    try:
+        df.to_parquet(parquet_path)
+    except (ImportError, TypeError, ValueError):
+        # Don't leave a partially written cache behind
+        if os.path.exists(parquet_path):
+            os.remove(parquet_path)
+    return df[columns] if columns is not None else df
+
+
 def create_file_dir_if_not_exists(file_path: str) -> None:
     """Create the directory for a file if it doesn't already exist."""
     file_dir = os.path.dirname(file_path)
@@ -66,8 +111,8 @@ def initialize_plot_default() -> None:
     plt.rcParams["figure.figsize"] = (8, 5)
     # Make title larger
     plt.rcParams["axes.titlesize"] = 16
-    # Higher DPI
-    plt.rcParams["figure.dpi"] = 300
+    # Screen DPI for drawing; save_plot renders the saved file at a higher DPI
+    plt.rcParams["figure.dpi"] = 100
     # Default marker
     plt.rcParams["lines.marker"] = "o"
     # Default marker size
@@ -83,11 +128,15 @@ def initialize_plot_bar() -> None:
     plt.rcParams["lines.marker"] = ""
 
 
+@functools.cache
+def _palette_colors() -> tuple[tuple[float, float, float], ...]:
+    """Get the colors of the default palette, resolved once."""
+    return tuple(sns.color_palette(DEFAULT_COLOR_PALETTE))
+
+
 def _get_color_from_palette(index: int) -> Any:
     """Get a color from the default palette."""
-    palette = sns.color_palette(DEFAULT_COLOR_PALETTE)
-    color = palette[index]
-    return color
+    return _palette_colors()[index]
 
 
 def geometric_mean(values: list[float]) -> float:
@@ -115,8 +164,6 @@ def get_results_full_path(relative_path: str) -> str:
 
 ALL_POWER_ABBREVIATIONS = ["AUS", "ENG", "FRA", "GER", "ITA", "RUS", "TUR"]
 
-DEFAULT_COLOR_PALETTE = "colorblind"
-
 MODELS_NAMES_COLORS = [
     ("Super Exploiter", "Exploiter\n(GPT-4)", 2),
     ("llama-2-70b-chat", "Llama 2\n(70B)", 5),
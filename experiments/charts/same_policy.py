@@ -5,6 +5,7 @@ Charts for Same Policy experiments.
 import os
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import seaborn as sns
 
@@ -17,6 +18,7 @@ from chart_utils import (
     MODEL_ORDER,
     initialize_plot_bar,
     initialize_plot_default,
+    load_cached,
     save_plot,
     get_results_full_path,
 )
@@ -31,6 +33,17 @@ INPUT_FILES_MODELS = [
 ]
 INPUT_FILE_OPTIMAL_PROSOCIAL = "../results/same_policy/Optimal Prosocial.csv"
 INPUT_FILE_RANDOM = "../results/same_policy/SP Random.csv"
+INPUT_COLUMNS = [
+    "agent_model",
+    "super_exploiter_powers",
+    "_progress/year_fractional",
+    "_progress/percent_done",
+    "benchmark/nash_social_welfare_global",
+    "benchmark/competence_score",
+    "combat/game_conflicts_avg",
+    "conquest/game_centers_lost_avg",
+] + [f"score/welfare/{power}" for power in ALL_POWER_ABBREVIATIONS]
+INPUT_DTYPES = {"agent_model": "category", "super_exploiter_powers": "string"}
 
 OUTPUT_DIR = "same_policy"
 NON_ROOT_WELFARE = False
@@ -41,7 +54,13 @@ def main() -> None:
 
     # Load the data from each file into one big dataframe
     df_models = pd.concat(
-        [pd.read_csv(get_results_full_path(f)) for f in INPUT_FILES_MODELS]
+        [
+            load_cached(
+                get_results_full_path(f), columns=INPUT_COLUMNS, dtype=INPUT_DTYPES
+            )
+            for f in INPUT_FILES_MODELS
+        ],
+        ignore_index=True,
     )
 
     # Preprocess a 2D table that has the WP for each [language model, power] combo for each run
@@ -81,20 +100,26 @@ def main() -> None:
     )
 
     # Load other data
-    df_optimal_prosocial = pd.read_csv(
-        get_results_full_path(INPUT_FILE_OPTIMAL_PROSOCIAL)
+    df_optimal_prosocial = load_cached(
+        get_results_full_path(INPUT_FILE_OPTIMAL_PROSOCIAL),
+        columns=INPUT_COLUMNS,
+        dtype=INPUT_DTYPES,
+    )
+    df_random = load_cached(
+        get_results_full_path(INPUT_FILE_RANDOM),
+        columns=INPUT_COLUMNS,
+        dtype=INPUT_DTYPES,
     )
-    df_random = pd.read_csv(get_results_full_path(INPUT_FILE_RANDOM))
     df_random["agent_model"] = "Random Policy"
 
-    # Change the agent model of all rows with non-empty super_exploiter_powers to "Super Exploiter"
-    df_models.loc[
-        df_models["super_exploiter_powers"].notnull(), "agent_model"
-    ] = "Super Exploiter"
-
-    # Rename models based on MODEL_NAME_TO_DISPLAY_NAME
-    df_models["agent_model"] = df_models["agent_model"].replace(
-        MODEL_NAME_TO_DISPLAY_NAME
+    # Rename models based on MODEL_NAME_TO_DISPLAY_NAME, treating all rows with non-empty
+    # super_exploiter_powers as "Super Exploiter"
+    df_models["agent_model"] = np.where(
+        df_models["super_exploiter_powers"].notna(),
+        MODEL_NAME_TO_DISPLAY_NAME["Super Exploiter"],
+        df_models["agent_model"]
+        .map(MODEL_NAME_TO_DISPLAY_NAME)
+        .fillna(df_models["agent_model"]),
     )
 
     # Print how many runs there are for each agent_model
@@ -105,7 +130,9 @@ def main() -> None:
     print(f"Average _progress/percent_done per agent_model:")
     print(df_models.groupby(["agent_model"])["_progress/percent_done"].mean())
 
-    # Plot a bunch of different bar graphs for different metrics
+    # Plot a bunch of different bar graphs for different metrics, reusing one figure
+    initialize_plot_bar()
+    fig, plot = plt.subplots()
     for (
         metric_name,
         y_label,
@@ -143,8 +170,8 @@ def main() -> None:
             "best",
         ),
     ]:
-        # Initialize
-        initialize_plot_bar()
+        # Clear the previous metric's plot
+        plot.clear()
 
         # Plot the welfare scores for each power
         cols_of_interest = [
@@ -152,14 +179,14 @@ def main() -> None:
             metric_name,
         ]
 
-        plot_df = df_models[cols_of_interest].copy()
+        plot_df = df_models[cols_of_interest]
 
         # Exponentiate nash welfare scores
         if NON_ROOT_WELFARE and "welfare" in metric_name:
             plot_df[metric_name] = plot_df[metric_name].pow(7)
             df_random[metric_name] = df_random[metric_name].pow(7)
             df_optimal_prosocial[metric_name] = df_optimal_prosocial[metric_name].pow(7)
-            plt.yscale("log")
+            plot.set_yscale("log")
 
         # update the column names
         x_label = "Agent Model"
@@ -171,17 +198,37 @@ def main() -> None:
             model_order.remove("Optimal Prosocial")
         if "Random Policy" in model_order:
             model_order.remove("Random Policy")
-        plot = sns.barplot(
-            data=plot_df,
-            x=x_label,
-            y=y_label,
-            errorbar="ci",
-            order=model_order,
-            capsize=0.2,
-            hue=x_label,
-            palette=MODEL_NAME_TO_COLOR,
-            # errwidth=2,
+        # Aggregate each model's mean and 95% confidence interval once up front
+        # rather than having seaborn bootstrap the confidence intervals
+        model_stats = (
+            plot_df.groupby(x_label)[y_label]
+            .agg(["mean", "std", "count"])
+            .reindex(model_order)
+        )
+        model_ci = 1.96 * model_stats["std"] / np.sqrt(model_stats["count"])
+        # 95% normal CI, but the lower bar is truncated at 0 for display since all
+        # these metrics are non-negative, so clipped bars are asymmetric
+        model_ci_lower = np.minimum(model_ci, model_stats["mean"])
+        plot.bar(
+            model_stats.index,
+            model_stats["mean"],
+            color=[
+                sns.desaturate(MODEL_NAME_TO_COLOR[model], 0.75)
+                for model in model_stats.index
+            ],
+        )
+        plot.errorbar(
+            model_stats.index,
+            model_stats["mean"],
+            yerr=[model_ci_lower, model_ci],
+            fmt="none",
+            capsize=8,
+            linewidth=2,
+            color=".26",
         )
+        # Match seaborn's categorical axis styling
+        plot.grid(False, axis="x")
+        plot.set_xlim(-0.5, len(model_order) - 0.5)
 
         if include_optimal:
             # Add horizontal line for optimal prosocial with label
@@ -193,7 +240,7 @@ def main() -> None:
                 linewidth=2,
                 label="Optimal Prosocial",
             )
-            plt.legend(loc=legend_loc)
+            plot.legend(loc=legend_loc)
 
         if include_random:
             # Calculate the average of the metric for random
@@ -206,24 +253,24 @@ def main() -> None:
                 linewidth=2,
                 label="Random Policy",
             )
-            plt.legend(loc=legend_loc)
+            plot.legend(loc=legend_loc)
 
         # Set labels and title
-        plt.xlabel(x_label)
+        plot.set_xlabel(x_label)
         y_axis_label = y_label
         if improvement_sign == 1:
             y_axis_label += " →"
         elif improvement_sign == -1:
             y_axis_label += " ←"
-        plt.ylabel(y_axis_label)
+        plot.set_ylabel(y_axis_label)
         title = f"{y_label} by Agent Model (Self-Play)"
-        plt.title(title)
+        plot.set_title(title)
 
         # Set y bounds
         if y_bounds[0] is not None:
-            plt.ylim(bottom=y_bounds[0])
+            plot.set_ylim(bottom=y_bounds[0])
         if y_bounds[1] is not None:
-            plt.ylim(top=y_bounds[1])
+            plot.set_ylim(top=y_bounds[1])
 
         # Save the plot
         output_file = get_results_full_path(
@@ -232,8 +279,8 @@ def main() -> None:
         save_plot(output_file)
         print(f"Saved plot '{title}' to {output_file}")
 
-        # Clear the plot
-        plt.clf()
+    # Close the figure to release it and its renderer
+    plt.close(fig)
 
     # Special plot: Scatterplot of roow nash welfare vs other things
     for x_axis, x_label in [
@@ -278,7 +325,7 @@ def main() -> None:
         save_plot(output_file)
         print(f"Saved plot '{title}' to {output_file}")
 
-        plt.clf()
+        plt.close()
 
 
 if __name__ == "__main__":
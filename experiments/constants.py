@@ -3,3 +3,9 @@
 MAX_BACKOFF_TIME_DEFAULT = 4096  # seconds
 
 WANDB_PROJECT = "welfare-diplomacy-v3"
+
+PROMPT_CACHE_DIR = ".prompt_cache"  # Used by --use_prompt_cache
+
+PROGRESS_BAR_MIN_INTERVAL_SEC = 0.5  # Throttles tqdm repaints between log lines
+
+TOKEN_HISTOGRAM_NUM_BINS = 16  # Phase token counts are binned locally before logging
@@ -5,16 +5,20 @@ Language model scaffolding to play Diplomacy.
 """
 
 import argparse
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
 import json
 import logging
 import os
+import random
+import statistics
 import traceback
 
 from diplomacy import Game, GamePhaseData, Message, Power
 from diplomacy.utils.export import to_saved_game_format
 import numpy as np
 from tqdm import tqdm
+import ujson
 import wandb
 from wandb.integration.openai import autolog
 
@@ -68,6 +72,8 @@ def main():
     autolog()  # Logs OpenAI API calls to wandb
 
     utils.set_seed(wandb.config.seed)
+    # Separate generator for the power ordering, unaffected by other random draws
+    power_order_rng = random.Random(wandb.config.seed)
 
     logging.basicConfig()
     logger.setLevel(wandb.config.log_level)
@@ -116,8 +122,12 @@ def main():
     exploiter_powers = [power.upper() for power in exploiter_powers if power != ""]
 
     utils.log_info(logger, f"⌛ Instantiating base agents {wandb.config.agent_model}")
+    prompt_cache_dir = (
+        constants.PROMPT_CACHE_DIR if wandb.config.use_prompt_cache else None
+    )
     agent_baseline: Agent = model_name_to_agent(
         wandb.config.agent_model,
+        seed=wandb.config.seed,
         temperature=wandb.config.temperature,
         top_p=wandb.config.top_p,
         manual_orders_path=wandb.config.manual_orders_path,
@@ -126,6 +136,7 @@ def main():
         quantization=wandb.config.quantization,
         fourbit_compute_dtype=wandb.config.fourbit_compute_dtype,
         disable_completion_preface=wandb.config.disable_completion_preface,
+        prompt_cache_dir=prompt_cache_dir,
     )
     power_name_to_agent = {
         power_name: agent_baseline for power_name in game.powers.keys()
@@ -137,9 +148,11 @@ def main():
         )
         agent_exploiter: Agent = model_name_to_agent(
             wandb.config.exploiter_model,
+            seed=wandb.config.seed,
             temperature=wandb.config.temperature,
             top_p=wandb.config.top_p,
             manual_orders_path=wandb.config.manual_orders_path,
+            prompt_cache_dir=prompt_cache_dir,
         )
         for power_name in exploiter_powers:
             power_name_to_agent[power_name] = agent_exploiter
@@ -181,6 +194,7 @@ def main():
             temperature=wandb.config.temperature,
             top_p=wandb.config.top_p,
             manual_orders_path=wandb.config.manual_orders_path,
+            prompt_cache_dir=prompt_cache_dir,
         )
         for power_name in super_exploiter_powers:
             power_name_to_agent[power_name] = agent_super_exploiter
@@ -213,26 +227,32 @@ def main():
     game_welfare_gain_avg_list: list[float] = []
     game_welfare_gain_median_list: list[float] = []
 
+    # Short power names used in the score keys, fixed for the whole game
+    power_name_to_short_name = {
+        power_name: power_name[:3] for power_name in game.powers.keys()
+    }
+
     # Log the initial state of the game
-    rendered_with_orders = game.render(incl_abbrev=True)
+    rendered_state = game.render(incl_abbrev=True)
     log_object = {
         "_progress/year_fractional": 0.0,
-        "board/rendering_with_orders": wandb.Html(rendered_with_orders),
-        "board/rendering_state": wandb.Html(rendered_with_orders),
+        "board/rendering_with_orders": wandb.Html(rendered_state),
+        "board/rendering_state": wandb.Html(rendered_state),
     }
-    for power in game.powers.values():
-        short_name = power.name[:3]
+    for power_name, power in game.powers.items():
+        short_name = power_name_to_short_name[power_name]
         log_object[f"score/units/{short_name}"] = len(power.units)
         log_object[f"score/welfare/{short_name}"] = power.welfare_points
         log_object[f"score/centers/{short_name}"] = len(power.centers)
 
     welfare_list = [power.welfare_points for power in game.powers.values()]
     log_object["welfare/hist"] = wandb.Histogram(welfare_list)
-    log_object["welfare/min"] = np.min(welfare_list)
-    log_object["welfare/max"] = np.max(welfare_list)
-    log_object["welfare/mean"] = np.mean(welfare_list)
-    log_object["welfare/median"] = np.median(welfare_list)
-    log_object["welfare/total"] = np.sum(welfare_list)
+    log_object["welfare/min"] = min(welfare_list)
+    log_object["welfare/max"] = max(welfare_list)
+    welfare_total = sum(welfare_list)
+    log_object["welfare/mean"] = welfare_total / len(welfare_list)
+    log_object["welfare/median"] = statistics.median(welfare_list)
+    log_object["welfare/total"] = welfare_total
 
     wandb.log(log_object)
 
@@ -241,9 +261,21 @@ def main():
         f"Starting game with map {wandb.config.map_name} and agent model {wandb.config.agent_model} summarized by {message_summarizer} ending after {wandb.config.max_years} years with {wandb.config.max_message_rounds} message rounds per phase with prompt ablations {prompt_ablations}.",
     )
 
-    progress_bar_phase = tqdm(total=simulation_max_years * 3, desc="🔄️ Phases")
+    # Optionally run the agent completions of each message round concurrently
+    completion_executor = (
+        ThreadPoolExecutor(max_workers=wandb.config.max_parallel_completions)
+        if wandb.config.max_parallel_completions > 1
+        else None
+    )
+
+    progress_bar_phase = tqdm(
+        total=simulation_max_years * 3,
+        desc="🔄️ Phases",
+        mininterval=constants.PROGRESS_BAR_MIN_INTERVAL_SEC,
+    )
     while not game.is_game_done:
-        utils.log_info(logger, f"🕰️  Beginning phase {game.get_current_phase()}")
+        current_phase = game.get_current_phase()
+        utils.log_info(logger, f"🕰️  Beginning phase {current_phase}")
 
         phase_orders_total_num = 0
         phase_orders_valid_num = 0
@@ -260,6 +292,8 @@ def main():
         phase_completion_tokens_list = []
         phase_total_tokens_list = []
         phase_message_history: list[tuple(str, int, str, str, str)] = []
+        # Powers that have been given orders in an earlier message round
+        phase_powers_with_orders: set[str] = set()
 
         # During Retreats, only 1 round of completions without press
         num_of_message_rounds = (
@@ -275,51 +309,79 @@ def main():
             else len([power for power in game.powers.values() if power.retreats])
         )
 
-        # Cache the list of possible orders for all locations
+        # Cache the list of possible orders for all locations, sorted for determinism
         possible_orders = game.get_all_possible_orders()
+        for location_orders in possible_orders.values():
+            location_orders.sort()
+        # Every legal order is also listed under its own unit location (including
+        # coasts), so one set of all of them gives the same validity check
+        possible_orders_set = frozenset(
+            order
+            for location_orders in possible_orders.values()
+            for order in location_orders
+        )
 
         progress_bar_messages = tqdm(
-            total=num_of_message_rounds * num_completing_powers, desc="🙊 Messages"
+            total=num_of_message_rounds * num_completing_powers,
+            desc="🙊 Messages",
+            mininterval=constants.PROGRESS_BAR_MIN_INTERVAL_SEC,
         )
         for message_round in range(1, num_of_message_rounds + 1):
             # Randomize order of powers
             powers_items = list(game.powers.items())
-            np.random.shuffle(powers_items)
+            power_order_rng.shuffle(powers_items)
 
             utils.log_info(
                 logger,
                 f"📨 Beginning message round {message_round}/{num_of_message_rounds}. Completion ordering: {', '.join([name for name, _ in powers_items])}",
             )
 
-            power: Power
-            for power_name, power in powers_items:
-                # Skip no-press powers until final message round
-                if (
+            # Skip no-press powers until final message round, and on retreat
+            # phases, skip powers that have no retreats to make
+            responding_powers_items = [
+                (power_name, power)
+                for power_name, power in powers_items
+                if not (
                     power_name in no_press_powers
                     and message_round < num_of_message_rounds
-                ):
-                    continue
-
-                # On retreat phases, skip powers that have no retreats to make
-                if game.phase_type == "R" and not power.retreats:
-                    continue
+                )
+                and not (game.phase_type == "R" and not power.retreats)
+            ]
+            power_name_to_params = {
+                power_name: AgentParams(
+                    power=power,
+                    game=game,
+                    message_summary_history=message_summary_history,
+                    possible_orders=possible_orders,
+                    current_message_round=message_round,
+                    max_message_rounds=num_of_message_rounds,
+                    final_game_year=final_game_year,
+                    prompt_ablations=prompt_ablations,
+                    exploiter_prompt=wandb.config.exploiter_prompt,
+                    exploiter_powers=exploiter_powers,
+                )
+                for power_name, power in responding_powers_items
+            }
+            # Start all the completions of this round at once if running in parallel
+            power_name_to_future: dict[str, Future] = {}
+            if completion_executor is not None:
+                for power_name, params in power_name_to_params.items():
+                    power_name_to_future[power_name] = completion_executor.submit(
+                        power_name_to_agent[power_name].respond, params
+                    )
+                # Agents read the shared game while building their prompts, so wait
+                # for the whole round before applying any orders or messages
+                wait(power_name_to_future.values())
 
+            power: Power
+            for power_name, power in responding_powers_items:
                 # Prompting the model for a response
                 agent = power_name_to_agent[power_name]
                 try:
-                    agent_response: AgentResponse = agent.respond(
-                        AgentParams(
-                            power=power,
-                            game=game,
-                            message_summary_history=message_summary_history,
-                            possible_orders=possible_orders,
-                            current_message_round=message_round,
-                            max_message_rounds=num_of_message_rounds,
-                            final_game_year=final_game_year,
-                            prompt_ablations=prompt_ablations,
-                            exploiter_prompt=wandb.config.exploiter_prompt,
-                            exploiter_powers=exploiter_powers,
-                        )
+                    agent_response: AgentResponse = (
+                        power_name_to_future[power_name].result()
+                        if completion_executor is not None
+                        else agent.respond(power_name_to_params[power_name])
                     )
                 except AgentCompletionError as exc:
                     # If the agent fails to complete, we need to log the error and continue
@@ -330,12 +392,12 @@ def main():
                     )
                     utils.log_error(
                         logger,
-                        f"🚨 {power_name} {game.get_current_phase()} Round {message_round}: Agent {agent} failed to complete ({phase_num_completion_errors} errors this phase). Skipping. Exception:\n{exception_trace}",
+                        f"🚨 {power_name} {current_phase} Round {message_round}: Agent {agent} failed to complete ({phase_num_completion_errors} errors this phase). Skipping. Exception:\n{exception_trace}",
                     )
                     # Log the error to Weights & Biases
                     game_completion_error_traces.append(
                         [
-                            game.get_current_phase(),
+                            current_phase,
                             message_round,
                             power_name,
                             exception_trace,
@@ -370,13 +432,23 @@ def main():
                 phase_num_valid_completions += 1
                 now = datetime.now()
                 current_time = now.strftime("%Y-%m-%d %H:%M:%S")
-                agent_log_string = f"⚙️  {current_time} {power_name} {game.get_current_phase()} Round {message_round}: Agent {agent} took {agent_response.completion_time_sec:.2f}s to respond."
+                agent_log_format = "⚙️  %s %s %s Round %d: Agent %s took %.2fs to respond."
+                agent_log_args = [
+                    current_time,
+                    power_name,
+                    current_phase,
+                    message_round,
+                    agent,
+                    agent_response.completion_time_sec,
+                ]
                 if isinstance(wandb.run.mode, wandb.sdk.lib.disabled.RunDisabled):
-                    agent_log_string += f"\nReasoning: {agent_response.reasoning}\nOrders: {agent_response.orders}\nMessages: {agent_response.messages}"
-                utils.log_info(
-                    logger,
-                    agent_log_string,
-                )
+                    agent_log_format += "\nReasoning: %s\nOrders: %s\nMessages: %s"
+                    agent_log_args += [
+                        agent_response.reasoning,
+                        agent_response.orders,
+                        agent_response.messages,
+                    ]
+                utils.log_info(logger, agent_log_format, *agent_log_args)
                 # Check how many of the orders were valid
                 num_valid_orders = 0
                 invalid_orders = []
@@ -389,8 +461,7 @@ def main():
                         num_valid_orders += 1
                         invalid_orders.append(order)
                         continue
-                    word = order.split()
-                    if len(word) < 2:
+                    if len(order.split(maxsplit=1)) < 2:
                         utils.log_warning(
                             logger,
                             f"Order needs to be longer than 1 word",
@@ -398,11 +469,7 @@ def main():
                         num_valid_orders += 1
                         invalid_orders.append(order)
                         continue
-                    location = word[1]
-                    if (
-                        location in possible_orders
-                        and order in possible_orders[location]
-                    ):
+                    if order in possible_orders_set:
                         num_valid_orders += 1
                     else:
                         invalid_orders.append(order)
@@ -418,12 +485,13 @@ def main():
                 if isinstance(wandb.run.mode, wandb.sdk.lib.disabled.RunDisabled):
                     utils.log_info(
                         logger,
-                        f"✔️  {power_name} valid orders: {num_valid_orders}/{num_orders} = {valid_order_display_percent:.2f}%"
-                        + (
-                            f". Invalid Orders: {invalid_orders}"
-                            if invalid_orders
-                            else ""
-                        ),
+                        "✔️  %s valid orders: %d/%d = %.2f%%"
+                        + (". Invalid Orders: %s" if invalid_orders else ""),
+                        power_name,
+                        num_valid_orders,
+                        num_orders,
+                        valid_order_display_percent,
+                        *([invalid_orders] if invalid_orders else []),
                     )
                 phase_orders_total_num += num_orders
                 phase_orders_valid_num += num_valid_orders
@@ -440,8 +508,11 @@ def main():
                     )
                 )
 
-                # Set orders, clearing first due to multiple message rounds
-                game.set_orders(power_name, [])
+                # Set orders, clearing first due to multiple message rounds. An empty
+                # set_orders() doesn't remove orders, so clear_orders() is needed
+                if power_name in phase_powers_with_orders:
+                    game.clear_orders(power_name)
+                phase_powers_with_orders.add(power_name)
                 try:
                     game.set_orders(power_name, agent_response.orders)
                 except Exception as exc:
@@ -453,12 +524,12 @@ def main():
                     )
                     utils.log_error(
                         logger,
-                        f"🚨 {power_name} {game.get_current_phase()} Round {message_round}: Agent {wandb.config.agent_model} gave an invalid order ({phase_num_completion_errors} errors this phase). Skipping. Exception:\n{exception_trace}",
+                        f"🚨 {power_name} {current_phase} Round {message_round}: Agent {wandb.config.agent_model} gave an invalid order ({phase_num_completion_errors} errors this phase). Skipping. Exception:\n{exception_trace}",
                     )
                     # Log the error to Weights & Biases
                     game_completion_error_traces.append(
                         [
-                            game.get_current_phase(),
+                            current_phase,
                             message_round,
                             power_name,
                             exception_trace,
@@ -482,12 +553,12 @@ def main():
                             sender=power_name,
                             recipient=recipient,
                             message=message,
-                            phase=game.get_current_phase(),
+                            phase=current_phase,
                         )
                     )
                     phase_message_history.append(
                         (
-                            game.get_current_phase(),
+                            current_phase,
                             message_round,
                             power_name,
                             recipient,
@@ -498,8 +569,13 @@ def main():
 
                 progress_bar_messages.update(1)
 
-        # Render saved orders and current turn message history before processing
-        rendered_with_orders = game.render(incl_abbrev=True)
+        # Render saved orders and current turn message history before processing.
+        # Without any orders the board is unchanged since the last render.
+        rendered_with_orders = (
+            game.render(incl_abbrev=True)
+            if any(game.get_orders().values())
+            else rendered_state
+        )
         messages_table = wandb.Table(
             columns=["phase", "round", "sender", "recipient", "message"],
             data=[
@@ -511,7 +587,9 @@ def main():
         # Save summaries of the message history
         if not game.no_press:
             for power_name, power in tqdm(
-                game.powers.items(), desc="✍️ Summarizing messages"
+                game.powers.items(),
+                desc="✍️ Summarizing messages",
+                mininterval=constants.PROGRESS_BAR_MIN_INTERVAL_SEC,
             ):
                 phase_message_summary = message_summarizer.summarize(
                     AgentParams(
@@ -560,6 +638,7 @@ def main():
         # Advance the game simulation to the next phase
         game.process()
         phase: GamePhaseData = game.get_phase_history()[-1]
+        processed_phase_type = phase.name[-1]
 
         # Check whether to end the game
         if int(game.phase.split()[1]) - 1900 > simulation_max_years:
@@ -568,7 +647,7 @@ def main():
         # Compute things to log to Weights & Biases
         rendered_state = game.render(incl_abbrev=True)
         phase_order_valid_ratio_avg = (
-            np.mean(valid_valid_order_ratios_list)
+            sum(valid_valid_order_ratios_list) / len(valid_valid_order_ratios_list)
             if len(valid_valid_order_ratios_list) > 0
             else None
         )
@@ -597,6 +676,22 @@ def main():
         )
         if phase_completion_time_sec_avg is not None:
             game_completion_time_avg_sec_list.append(phase_completion_time_sec_avg)
+        # Summarize the token counts with builtins, cheaper than numpy on a few values
+        phase_token_stats = {}
+        for token_type, tokens_list in [
+            ("prompt", phase_prompt_tokens_list),
+            ("completion", phase_completion_tokens_list),
+            ("total", phase_total_tokens_list),
+        ]:
+            phase_token_stats[f"tokens/{token_type}_tokens_avg"] = (
+                sum(tokens_list) / len(tokens_list) if tokens_list else None
+            )
+            phase_token_stats[f"tokens/{token_type}_tokens_min"] = (
+                min(tokens_list) if tokens_list else None
+            )
+            phase_token_stats[f"tokens/{token_type}_tokens_max"] = (
+                max(tokens_list) if tokens_list else None
+            )
         game_cost_estimate = (  # Based on GPT-4-8K at https://openai.com/pricing
             game_tokens_prompt_sum / 1000 * 0.03
             + game_tokens_completion_sum / 1000 * 0.06
@@ -659,7 +754,7 @@ def main():
             "orders/phase_valid_num": phase_orders_valid_num,
             "orders/game_valid_ratio": game_order_valid_ratio_avg_avg,
             "orders/phase_valid_ratio": phase_order_valid_ratio_avg,
-            f"orders/phase_valid_ratio_type_{phase.name[-1]}": phase_order_valid_ratio_avg,
+            f"orders/phase_valid_ratio_type_{processed_phase_type}": phase_order_valid_ratio_avg,
             "messages/messages_table": messages_table,
             "messages/message_summary_table": message_summary_table,
             "messages/phase_messages_total": phase_message_total,
@@ -695,79 +790,56 @@ def main():
             else None,
             "model/phase_num_completion_errors": phase_num_completion_errors,
             "model/game_num_completion_errors": game_num_completion_errors,
-            "tokens/prompt_tokens_avg": np.mean(phase_prompt_tokens_list)
-            if phase_prompt_tokens_list
-            else None,
-            "tokens/completion_tokens_avg": np.mean(phase_completion_tokens_list)
-            if phase_completion_tokens_list
-            else None,
-            "tokens/total_tokens_avg": np.mean(phase_total_tokens_list)
-            if phase_total_tokens_list
-            else None,
-            "tokens/prompt_tokens_min": np.min(phase_prompt_tokens_list)
-            if phase_prompt_tokens_list
-            else None,
-            "tokens/completion_tokens_min": np.min(phase_completion_tokens_list)
-            if phase_completion_tokens_list
-            else None,
-            "tokens/total_tokens_min": np.min(phase_total_tokens_list)
-            if phase_total_tokens_list
-            else None,
-            "tokens/prompt_tokens_max": np.max(phase_prompt_tokens_list)
-            if phase_prompt_tokens_list
-            else None,
-            "tokens/completion_tokens_max": np.max(phase_completion_tokens_list)
-            if phase_completion_tokens_list
-            else None,
-            "tokens/total_tokens_max": np.max(phase_total_tokens_list)
-            if phase_total_tokens_list
-            else None,
-            "tokens/prompt_tokens_median": np.median(phase_prompt_tokens_list)
-            if phase_prompt_tokens_list
-            else None,
-            "tokens/completion_tokens_median": np.median(phase_completion_tokens_list)
-            if phase_completion_tokens_list
-            else None,
-            "tokens/total_tokens_median": np.median(phase_total_tokens_list)
-            if phase_total_tokens_list
-            else None,
-            "tokens/prompt_tokens_hist": wandb.Histogram(phase_prompt_tokens_list),
+            **phase_token_stats,
+            "tokens/prompt_tokens_hist": wandb.Histogram(
+                np_histogram=np.histogram(
+                    phase_prompt_tokens_list, bins=constants.TOKEN_HISTOGRAM_NUM_BINS
+                )
+            ),
             "tokens/completion_tokens_hist": wandb.Histogram(
-                phase_completion_tokens_list
+                np_histogram=np.histogram(
+                    phase_completion_tokens_list,
+                    bins=constants.TOKEN_HISTOGRAM_NUM_BINS,
+                )
+            ),
+            "tokens/total_tokens_hist": wandb.Histogram(
+                np_histogram=np.histogram(
+                    phase_total_tokens_list, bins=constants.TOKEN_HISTOGRAM_NUM_BINS
+                )
             ),
-            "tokens/total_tokens_hist": wandb.Histogram(phase_total_tokens_list),
             "cost/estimated_token_cost_gpt4-usd": game_cost_estimate,
             "cost/prompt_tokens_total": game_tokens_prompt_sum,
             "cost/completion_tokens_total": game_tokens_completion_sum,
         }
 
-        for power in game.powers.values():
-            short_name = power.name[:3]
-            if phase.name[-1] == "A" or phase.name[-1] == "R":
-                # Centers/welfare/units only change after adjustments or sometimes retreats
+        if processed_phase_type == "A" or processed_phase_type == "R":
+            # Centers/welfare/units only change after adjustments or sometimes retreats
+            for power_name, power in game.powers.items():
+                short_name = power_name_to_short_name[power_name]
                 log_object[f"score/units/{short_name}"] = len(power.units)
                 log_object[f"score/welfare/{short_name}"] = power.welfare_points
                 log_object[f"score/centers/{short_name}"] = len(power.centers)
 
-        if phase.name[-1] == "A":
+        if processed_phase_type == "A":
             # Aggregated welfare
             welfare_list = [power.welfare_points for power in game.powers.values()]
             log_object["welfare_aggregation/hist"] = wandb.Histogram(welfare_list)
-            log_object["welfare_aggregation/min"] = np.min(welfare_list)
-            log_object["welfare_aggregation/max"] = np.max(welfare_list)
-            log_object["welfare_aggregation/mean"] = np.mean(welfare_list)
-            log_object["welfare_aggregation/median"] = np.median(welfare_list)
-            log_object["welfare_aggregation/total"] = np.sum(welfare_list)
+            log_object["welfare_aggregation/min"] = min(welfare_list)
+            log_object["welfare_aggregation/max"] = max(welfare_list)
+            welfare_total = sum(welfare_list)
+            log_object["welfare_aggregation/mean"] = welfare_total / len(welfare_list)
+            log_object["welfare_aggregation/median"] = statistics.median(welfare_list)
+            log_object["welfare_aggregation/total"] = welfare_total
 
             # Welfare gain
             welfare_gains = [
                 power.welfare_points - phase.state["welfare_points"][power_name]
                 for power_name, power in game.powers.items()
             ]
-            phase_welfare_gain_min = np.min(welfare_gains)
-            phase_welfare_gain_max = np.max(welfare_gains)
-            phase_welfare_gain_avg = np.mean(welfare_gains)
-            phase_welfare_gain_median = np.median(welfare_gains)
+            phase_welfare_gain_min = min(welfare_gains)
+            phase_welfare_gain_max = max(welfare_gains)
+            phase_welfare_gain_avg = sum(welfare_gains) / len(welfare_gains)
+            phase_welfare_gain_median = statistics.median(welfare_gains)
             game_welfare_gain_min_list.append(phase_welfare_gain_min)
             game_welfare_gain_max_list.append(phase_welfare_gain_max)
             game_welfare_gain_avg_list.append(phase_welfare_gain_avg)
@@ -849,7 +921,7 @@ def main():
                 game.map.scs
             )
 
-        if phase.name[-1] == "M":
+        if processed_phase_type == "M":
             # Track combat as measured by number of tiles where multiple units moved or held
             combat_dicts = [moving_units for moving_units in game.combat.values()]
             num_moving_units = [sum(len(v) for v in d.values()) for d in combat_dicts]
@@ -915,7 +987,7 @@ def main():
             list(benchmark_competence_factors.values())
         )
 
-        if phase.name[-1] == "A":
+        if processed_phase_type == "A":
             # Aggregated WFD Benchmark scores
             years_passed = utils.get_phase_years_passed(phase)
             welfare_points_per_year = [
@@ -1038,6 +1110,9 @@ def main():
                 f"Too many completion errors ({game_num_completion_errors}/{wandb.config.max_completion_errors})! Ending game."
             )
 
+    if completion_executor is not None:
+        completion_executor.shutdown()
+
     # Game completed, log game save for reloading it later
     saved_game_data = to_saved_game_format(game)
     wandb.log(
@@ -1053,12 +1128,11 @@ def main():
         if not os.path.exists(wandb.config.output_folder):
             os.makedirs(wandb.config.output_folder)
         output_id = "debug" if wandb.config.disable_wandb else wandb.run.id
-        to_saved_game_format(
-            game,
-            output_path=os.path.join(
-                wandb.config.output_folder, f"game-{output_id}.json"
-            ),
-        )
+        output_path = os.path.join(wandb.config.output_folder, f"game-{output_id}.json")
+        # Reuse the saved game data rather than converting the game again, appending
+        # the same ujson line that to_saved_game_format(output_path=...) would write
+        with open(output_path, "a", encoding="utf-8") as output_file:
+            output_file.write(ujson.dumps(saved_game_data) + "\n")
 
 
 def parse_args():
@@ -1270,6 +1344,19 @@ def parse_args():
         default=10,
         help="🤐Number of centers a super exploiter acquires before it switches back to the LLMAgent policy.",
     )
+    parser.add_argument(
+        "--max_parallel_completions",
+        dest="max_parallel_completions",
+        type=int,
+        default=1,
+        help="⚡Max number of agent completions to run concurrently within a message round. If above 1, powers don't see messages sent by other powers in the same round until the next round, and one agent is shared by all its powers across threads, so llama agent models and exploiter agents (--exploiter_model exploiter or --super_exploiter_powers) are rejected.",
+    )
+    parser.add_argument(
+        "--use_prompt_cache",
+        dest="use_prompt_cache",
+        action="store_true",
+        help=f"💽Cache LLM completions on disk in {constants.PROMPT_CACHE_DIR}, keyed on the model, sampling parameters, and prompts, to replay identical prompts. Only applies when temperature is 0.",
+    )
 
     args = parser.parse_args()
     return args
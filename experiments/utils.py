@@ -5,6 +5,7 @@ import random
 from typing import Any
 
 from diplomacy import Game, GamePhaseData
+import logging
 from logging import Logger
 from nltk.translate.bleu_score import sentence_bleu, SmoothingFunction
 from tqdm.contrib.logging import logging_redirect_tqdm
@@ -44,22 +45,40 @@ def get_phase_fractional_years_passed(game_phase_data: GamePhaseData) -> float:
     return year + fraction
 
 
-def log_info(logger: Logger, message: str) -> None:
-    """Redirect logger to play nice with tqdm."""
+def log_info(logger: Logger, message: str, *args: Any) -> None:
+    """
+    Redirect logger to play nice with tqdm.
+
+    Any args are %-formatted into the message by logging, only if it will be emitted.
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return
     with logging_redirect_tqdm():
-        logger.info(message)
+        logger.info(message, *args)
 
 
-def log_warning(logger: Logger, message: str) -> None:
-    """Redirect logger to play nice with tqdm."""
+def log_warning(logger: Logger, message: str, *args: Any) -> None:
+    """
+    Redirect logger to play nice with tqdm.
+
+    Any args are %-formatted into the message by logging, only if it will be emitted.
+    """
+    if not logger.isEnabledFor(logging.WARNING):
+        return
     with logging_redirect_tqdm():
-        logger.warning(message)
+        logger.warning(message, *args)
+
 
+def log_error(logger: Logger, message: str, *args: Any) -> None:
+    """
+    Redirect logger to play nice with tqdm.
 
-def log_error(logger: Logger, message: str) -> None:
-    """Redirect logger to play nice with tqdm."""
+    Any args are %-formatted into the message by logging, only if it will be emitted.
+    """
+    if not logger.isEnabledFor(logging.ERROR):
+        return
     with logging_redirect_tqdm():
-        logger.error(message)
+        logger.error(message, *args)
 
 
 def remove_duplicates_keep_order(lst: list[Any]) -> list[Any]:
@@ -118,6 +137,21 @@ def validate_config(config: wandb.Config, game: Game):
     assert config.max_years > 0
     assert config.early_stop_max_years >= 0
     assert config.max_message_rounds >= 0
+    assert config.max_parallel_completions >= 1
+
+    # Check parallel completions only use agents that are safe to share across threads
+    if config.max_parallel_completions > 1:
+        for model_name in [config.agent_model, config.exploiter_model]:
+            assert not model_name or "llama" not in model_name, (
+                f'Model "{model_name}" runs a local HuggingFace model that can\'t be '
+                "shared across threads. Use --max_parallel_completions 1."
+            )
+        assert (
+            config.exploiter_model != "exploiter" and not config.super_exploiter_powers
+        ), (
+            "Exploiter agents keep mutable state per game that can't be shared across "
+            "threads. Use --max_parallel_completions 1."
+        )
 
     # Check that manual orders file exists
     if config.manual_orders_path: